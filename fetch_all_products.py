@@ -4,83 +4,398 @@
 # Usage: python fetch_all_products.py
 # Optional: set --use-selenium to enable selenium rendering for sites that require JS.
 
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import aiohttp
 import csv
+import functools
+import logging
+from concurrent.futures import ProcessPoolExecutor
 import time
 import re
+import shutil
 import argparse
 from datetime import datetime
-from tqdm import tqdm
-import pandas as pd
+from urllib.parse import urljoin
+from tqdm.asyncio import tqdm_asyncio
+from tqdm.contrib.logging import logging_redirect_tqdm
 import os
+import sqlite3
 import sys
+import weakref
+
+log = logging.getLogger("scrape")
+
+# HTML parser: selectolax (lexbor) is much faster; BeautifulSoup is the fallback
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_OK = True
+except Exception:
+    from bs4 import BeautifulSoup, SoupStrainer
+    import soupsieve
+    SELECTOLAX_OK = False
+
+# Optional: brotli lets aiohttp decode "br" responses
+try:
+    try:
+        import brotli
+    except ImportError:
+        import brotlicffi as brotli
+    BROTLI_OK = True
+except Exception:
+    BROTLI_OK = False
 
 # Optional selenium
 USE_SELENIUM = False
 try:
     from selenium import webdriver
     from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException
     SELENIUM_OK = True
 except Exception:
     SELENIUM_OK = False
 
 REQUEST_HEADERS = {
-    "User-Agent": "product-scraper/1.0 (+https://example.com) Python/requests"
+    "User-Agent": "product-scraper/1.0 (+https://example.com) Python/aiohttp",
+    "Accept": "text/html,application/xhtml+xml",
+    # only advertise br when we can decode it
+    "Accept-Encoding": "gzip, deflate, br" if BROTLI_OK else "gzip, deflate",
 }
 
+# All fetches of a crawl share one session; at most CONCURRENCY requests are in
+# flight per session. The limit is a semaphore made alongside each session:
+# a module-level one would bind to the first event loop that used it, and
+# leaving it to the connector pool would let queued requests burn their
+# ClientTimeout before they are even sent.
+CONCURRENCY = 16
+_FETCH_LIMITS = weakref.WeakKeyDictionary()
+
+# Transient failures (connection errors, timeouts, these statuses) are retried
+# FETCH_RETRIES times, sleeping FETCH_BACKOFF * 2**attempt seconds in between.
+FETCH_RETRIES = 2
+FETCH_BACKOFF = 0.3
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
 OUTPUT_DIR = "output_products"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Pages are cached on disk between runs. Within HTTP_CACHE_TTL seconds the
+# cached copy is used as-is; after that it is revalidated with a conditional GET.
+HTTP_CACHE_PATH = os.path.join(OUTPUT_DIR, "http_cache.sqlite")
+HTTP_CACHE_TTL = 86400
+
+# Compiled once; these run for every scraped row.
+_KEY_RE = re.compile(r'[^a-z0-9()\- ]')
+_SLUG_RE = re.compile(r'[^A-Za-z0-9]+')
+
+# Where product names usually live on the listing pages. Each list is one
+# selector group so a page is walked once, not once per selector.
+MIKROTIK_TITLES = ', '.join((
+    '.product-title', '.product-card__title', 'h3', 'h4', '.title', '.product-name'
+))
+# Mimosa/Cambium product links; matching on the href prefix in the selector
+# means non-product anchors are rejected by the parser, before any text is read.
+PRODUCT_LINKS = 'a[href^="/products/"]'
+UBIQUITI_TITLES = ', '.join((
+    '.product-card__title', '.product-title', 'h2', 'h3', '.product-title a', '.card-title'
+))
+# Product-only subset for Selenium to wait on; any page shell already has h2/h3.
+UBIQUITI_PRODUCT_TITLES = '.product-card__title, .product-title, .card-title'
+
 # ---------- Helpers ----------
+def setup_logging(level=logging.INFO):
+    # also called in each worker process, which may not inherit the parent's config
+    logging.basicConfig(format='%(message)s', level=logging.INFO)
+    log.setLevel(level)
+
 def clean_text(s):
-    if s is None: return ''
-    return re.sub(r'\s+', ' ', s).strip()
+    # split()/join() collapses whitespace runs and trims the ends without the regex engine
+    if not s: return ''
+    return ' '.join(s.split())
+
+def make_emit(write):
+    """
+    Every scraped row goes through the returned emit(row). The first row seen for a
+    (brand, normalized model) key is passed to write(row); later ones are dropped.
+    Only the keys are kept in memory. emit() returns True if the row was new.
+    """
+    seen = set()
 
-def save_to_csv(rows, filename):
+    def emit(row):
+        key = (row['brand'].lower(), _KEY_RE.sub('', row['model'].lower()))
+        if key in seen:
+            return False
+        seen.add(key)
+        write(row)
+        return True
+    return emit
+
+class HttpCache:
+    """
+    URL -> (etag, last_modified, fetched_at, body) store in SQLite.
+    The connection is opened on first use so importing the module stays cheap.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._db = None
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, fetched_at REAL, body TEXT)"
+            )
+        return self._db
+
+    def get(self, url):
+        return self.db.execute(
+            "SELECT etag, last_modified, fetched_at, body FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+
+    def put(self, url, etag, last_modified, body):
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, time.time(), body),
+            )
+
+    def touch(self, url):
+        with self.db:
+            self.db.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+HTTP_CACHE = HttpCache(HTTP_CACHE_PATH)
+
+class CsvSink:
+    """
+    Streams one brand's rows into <brand>_<ts>.csv as they are emitted.
+    The file is created on the first row, so a brand that yields nothing leaves
+    no file behind, and a crawl that fails removes its partial file.
+
+        with CsvSink(brand, ts) as sink:
+            sink.write(row)
+    """
     keys = ['category', 'brand', 'model', 'source_url']
-    path = os.path.join(OUTPUT_DIR, filename)
-    with open(path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, keys)
-        writer.writeheader()
-        for r in rows:
-            writer.writerow({k: r.get(k,'') for k in keys})
-    print(f"[+] Saved {len(rows)} rows to {path}")
-    return path
 
-def maybe_selenium_get(url, driver=None, wait_s=1.0):
+    def __init__(self, brand, ts):
+        bn = _SLUG_RE.sub('_', brand).strip('_').lower()
+        self.path = os.path.join(OUTPUT_DIR, f"{bn}_{ts}.csv")
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def write(self, row):
+        if self._writer is None:
+            self._file = open(self.path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.keys)
+        # plain tuple in self.keys order; avoids rebuilding a dict per row for DictWriter
+        self._writer.writerow((row.get('category',''), row.get('brand',''), row.get('model',''), row.get('source_url','')))
+        self.count += 1
+
+    def __exit__(self, exc_type, *exc):
+        if self._file is not None:
+            self._file.close()
+            if exc_type is not None:
+                os.remove(self.path)
+                self.count = 0
+        return False
+
+def append_csv(out, path):
+    """Copy the data rows of a CsvSink file onto the open file `out`, without parsing them."""
+    with open(path, newline='', encoding='utf-8') as f:
+        f.readline()  # header
+        shutil.copyfileobj(f, out)
+
+# Thin parser layer so the scrapers don't care which backend is installed.
+if SELECTOLAX_OK:
+    def parse_html(html):
+        return LexborHTMLParser(html)
+
+    def css(tree, sel):
+        return tree.css(sel)
+
+    def node_text(node):
+        return node.text()
+
+    def node_href(node):
+        return node.attributes.get('href') or ''
+
+    def parent_link(node):
+        """Closest <a href> ancestor of node, or None."""
+        p = node.parent
+        while p is not None:
+            if p.tag == 'a' and p.attributes.get('href'):
+                return p
+            p = p.parent
+        return None
+else:
+    # Only build <body>: <head> (meta, styles, scripts) never becomes Python
+    # objects. Title elements can sit anywhere in the body - a <span> or <p>
+    # straight under <main> - so nothing narrower is safe to filter on.
+    _ONLY_CONTENT = SoupStrainer('body')
+
+    def parse_html(html):
+        return BeautifulSoup(html, "lxml", parse_only=_ONLY_CONTENT)
+
+    _compile_sel = functools.lru_cache(maxsize=None)(soupsieve.compile)
+
+    def css(tree, sel):
+        # soupsieve would otherwise re-parse the selector on every call
+        return _compile_sel(sel).select(tree)
+
+    def node_text(node):
+        return node.get_text()
+
+    def node_href(node):
+        return node.get('href') or ''
+
+    def parent_link(node):
+        """Closest <a href> ancestor of node, or None."""
+        return node.find_parent('a', href=True)
+
+def make_session():
+    session = aiohttp.ClientSession(
+        headers=REQUEST_HEADERS,
+        timeout=aiohttp.ClientTimeout(total=20),
+        # keep idle connections around long enough to be reused across pages of a site
+        connector=aiohttp.TCPConnector(
+            limit=2 * CONCURRENCY, limit_per_host=CONCURRENCY, ttl_dns_cache=300, keepalive_timeout=60,
+        ),
+    )
+    _FETCH_LIMITS[session] = asyncio.Semaphore(CONCURRENCY)
+    return session
+
+def _is_transient(e):
+    if isinstance(e, aiohttp.ClientResponseError):
+        return e.status in RETRY_STATUSES
+    return isinstance(e, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+async def _afetch(session, url, timeout=None):
+    cached = HTTP_CACHE.get(url)
+    if cached and time.time() - cached[2] < HTTP_CACHE_TTL:
+        return cached[3]
+    kwargs = {'timeout': aiohttp.ClientTimeout(total=timeout)} if timeout else {}
+    headers = {}
+    if cached:
+        etag, last_modified = cached[0], cached[1]
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+    limit = _FETCH_LIMITS[session]
+    for attempt in range(FETCH_RETRIES + 1):
+        try:
+            # wait for a slot before session.get so queueing time isn't counted against the timeout
+            async with limit:
+                async with session.get(url, headers=headers, **kwargs) as resp:
+                    if resp.status == 304 and cached:
+                        HTTP_CACHE.touch(url)
+                        return cached[3]
+                    resp.raise_for_status()
+                    body = await resp.text()
+                    if 'no-store' not in resp.headers.get('Cache-Control', ''):
+                        HTTP_CACHE.put(url, resp.headers.get('ETag'), resp.headers.get('Last-Modified'), body)
+                    return body
+        except Exception as e:
+            if attempt == FETCH_RETRIES or not _is_transient(e):
+                raise
+        await asyncio.sleep(FETCH_BACKOFF * 2 ** attempt)
+
+async def _afetch_safe(session, url, timeout=None):
+    """Like _afetch but returns (url, html_or_exception) so gather never aborts."""
+    try:
+        return url, await _afetch(session, url, timeout)
+    except Exception as e:
+        return url, e
+
+def _driver_get(driver, url, wait_s, ready_css=None):
+    driver.get(url)
+    # Wait at most wait_s for the document to finish loading and, if given,
+    # for ready_css to show up - usually much sooner than a fixed sleep.
+    def ready(d):
+        if d.execute_script("return document.readyState") != "complete":
+            return False
+        return not ready_css or bool(d.find_elements(By.CSS_SELECTOR, ready_css))
+    try:
+        WebDriverWait(driver, wait_s, poll_frequency=0.1).until(ready)
+    except TimeoutException:
+        pass
+    return driver.page_source
+
+async def maybe_selenium_get(session, url, driver=None, wait_s=1.0, ready_css=None):
     if driver:
-        driver.get(url)
-        time.sleep(wait_s)
-        return driver.page_source
+        # selenium is blocking; keep it off the event loop
+        return await asyncio.to_thread(_driver_get, driver, url, wait_s, ready_css)
     else:
-        r = requests.get(url, headers=REQUEST_HEADERS, timeout=20)
-        r.raise_for_status()
-        return r.text
+        return await _afetch(session, url)
 
 # ---------- MikroTik scraper ----------
-def fetch_mikrotik():
+# Category keywords, lowercased; buckets are checked in priority order
+# switch > ap > ptp. Switch and ptp keywords must equal a word or letter run.
+# MikroTik builds AP names by gluing a family onto other letters (LtAP, mAP,
+# cAPGi, wAPG, SXTsq, nanoStation), so an AP keyword only has to start or end
+# a letter run.
+SWITCH_KW = frozenset({'switch', 'crs', 'sfp', 'sg'})
+AP_KW = frozenset({'hap', 'wap', 'cap', 'ap', 'wireless', 'nano', 'sxt', 'lbe'})
+PTP_KW = frozenset({'ptp', 'ptmp', 'backhaul', 'c5', 'b5'})
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+_ALPHA_RE = re.compile(r'[a-z]+')
+
+def _is_ap(runs):
+    for run in runs:
+        if run.startswith('rb'):
+            # RouterBOARD part numbers: RBLtAP-2HnD, RBSXTsq5nD
+            run = run[2:]
+        if run and any(run.startswith(k) or run.endswith(k) for k in AP_KW):
+            return True
+    return False
+
+def guess_mikrotik_category(model):
+    """Category guess based on keywords in the model name."""
+    m = model.lower()
+    # whole words plus their letter runs, so "crs326-24g" yields crs326, crs, 24g, g
+    runs = _ALPHA_RE.findall(m)
+    words = set(_WORD_RE.findall(m))
+    words.update(runs)
+    if words & SWITCH_KW:
+        return 'switch'
+    elif words & AP_KW or _is_ap(runs):
+        return 'ap'
+    elif words & PTP_KW:
+        return 'ptp'
+    return 'router'
+
+async def fetch_mikrotik(session, emit):
     """
     Scrape mikrotik.com/products and category pages.
     Works by crawling /products and category group pages.
     """
     base = "https://mikrotik.com"
     start = base + "/products"
-    rows = []
-    print("[mikrotik] Fetching main products page...")
-    r = requests.get(start, headers=REQUEST_HEADERS, timeout=20)
-    r.raise_for_status()
-    soup = BeautifulSoup(r.text, "lxml")
+    added = 0
+    skipped = 0
+    log.info("[mikrotik] Fetching main products page...")
+    soup = parse_html(await _afetch(session, start))
 
     # Approach: find product links by CSS selectors - on mikrotik site products are anchors to /product/<slug> or group pages
     # We'll gather product links from the main page and from group pages
     links = set()
     # gather anchors to /product/ or /products/group or /products/<something>
-    for a in soup.find_all('a', href=True):
-        href = a['href']
-        if href.startswith('/product') or href.startswith('/products/group') or href.startswith('/products/'):
-            full = requests.compat.urljoin(base, href)
-            links.add(full)
+    # (the prefix test runs inside the parser, so other anchors never reach Python)
+    for a in css(soup, 'a[href^="/product"]'):
+        links.add(base + node_href(a))
 
     # Also try direct group pages for categories known
     group_pages = [
@@ -94,169 +409,146 @@ def fetch_mikrotik():
     for gp in group_pages:
         links.add(gp)
 
-    print(f"[mikrotik] Found {len(links)} candidate pages — crawling them...")
-    for url in tqdm(sorted(links)):
-        try:
-            page = requests.get(url, headers=REQUEST_HEADERS, timeout=20)
-            page.raise_for_status()
-            s = BeautifulSoup(page.text, "lxml")
-            # product card titles often in h3 or h4 or .product-title
-            # find image cards with product title
-            # attempt multiple selectors:
-            sel_candidates = [
-                '.product-title', '.product-card__title', 'h3', 'h4', '.title', '.product-name'
-            ]
-            found = []
-            for sel in sel_candidates:
-                for el in s.select(sel):
-                    txt = clean_text(el.get_text())
+    log.info("[mikrotik] Found %d candidate pages — crawling them...", len(links))
+    # parse each page as soon as it arrives instead of after the whole crawl, but
+    # emit in sorted(links) order so the first (kept) row per model doesn't
+    # depend on which response came back first
+    urls = sorted(links)
+
+    async def indexed(i, url):
+        return i, await _afetch_safe(session, url)
+
+    pending = [indexed(i, u) for i, u in enumerate(urls)]
+    done = {}
+    next_i = 0
+    # log lines go through tqdm.write so they don't tear the progress bar
+    with logging_redirect_tqdm():
+        for next_page in tqdm_asyncio.as_completed(pending, total=len(pending)):
+            i, (url, html) = await next_page
+            rows = []
+            try:
+                if isinstance(html, Exception):
+                    raise html
+                s = parse_html(html)
+                # product card titles often in h3 or h4 or .product-title
+                # find image cards with product title
+                # attempt multiple selectors in one pass:
+                for el in css(s, MIKROTIK_TITLES):
+                    txt = clean_text(node_text(el))
                     if txt and len(txt) < 120:
                         # try to find price/label parent link for URL
-                        parent_a = el.find_parent('a', href=True)
-                        source = parent_a['href'] if parent_a else url
+                        parent_a = parent_link(el)
+                        source = node_href(parent_a) if parent_a else url
                         if source and source.startswith('/'):
-                            source = requests.compat.urljoin(base, source)
+                            # site-relative paths just need the origin; urljoin only for //host/...
+                            source = base + source if source[1:2] != '/' else urljoin(base, source)
                         rows.append({
-                            'category': '', 'brand': 'MikroTik', 'model': txt, 'source_url': source
+                            'category': guess_mikrotik_category(txt), 'brand': 'MikroTik',
+                            'model': txt, 'source_url': source
                         })
-                        found.append(txt)
-            # fallback: list items with product names inside cards
-            # also try .product-list .card
-            for card in s.select('.product, .product-card, .card, .catalog-item'):
-                text = clean_text(card.get_text())
-                # heuristic: first line as name
-                name = text.splitlines()[0] if text else ''
-                if name and len(name) < 120:
-                    rows.append({'category':'','brand':'MikroTik','model':name,'source_url':url})
-        except Exception as e:
-            # skip errors
-            print("[mikrotik] skip", url, "err:", e)
-            continue
-
-    # dedupe by model name
-    seen = set()
-    unique = []
-    for r in rows:
-        key = (r['brand'].lower(), r['model'].lower())
-        if key in seen: continue
-        seen.add(key)
-        unique.append(r)
-
-    print(f"[mikrotik] Collected {len(unique)} unique models (raw).")
-    # assign category guess based on keywords
-    for r in unique:
-        m = r['model'].lower()
-        if any(k in m for k in ['switch','crs','switch','sfp','sg']):
-            r['category'] = 'switch'
-        elif any(k in m for k in ['hap','wAP','cap','ap','wireless','nano','sxt','lbe']):
-            r['category'] = 'ap'
-        elif any(k in m for k in ['ptp','ptmp','backhaul','c5','b5']):
-            r['category'] = 'ptp'
-        else:
-            r['category'] = 'router'
-    return unique
+                # fallback, only for pages without any title element: whole card text as name
+                if not rows:
+                    for card in css(s, '.product, .product-card, .card, .catalog-item'):
+                        name = clean_text(node_text(card))
+                        if name and len(name) < 120:
+                            rows.append({'category':guess_mikrotik_category(name),'brand':'MikroTik','model':name,'source_url':url})
+            except Exception as e:
+                # skip errors; details only at debug level so a burst of failures stays cheap
+                skipped += 1
+                log.debug("[mikrotik] skip %s err: %s", url, e)
+                rows = []
+            done[i] = rows
+            while next_i in done:
+                for row in done.pop(next_i):
+                    added += emit(row)
+                next_i += 1
+
+    if skipped:
+        log.info("[mikrotik] Skipped %d pages that failed (--verbose for details).", skipped)
+    log.info("[mikrotik] Collected %d unique models (raw).", added)
+    return added
 
 # ---------- Mimosa scraper ----------
-def fetch_mimosa():
-    rows = []
+async def fetch_mimosa(session, emit):
+    added = 0
     base = "https://mimosa.co"
     start = base + "/products"
-    print("[mimosa] fetching product listing...")
-    r = requests.get(start, headers=REQUEST_HEADERS, timeout=20)
-    r.raise_for_status()
-    s = BeautifulSoup(r.text, "lxml")
+    categories = ['accessories','antennas','backhaul','access-points','clients']
+    log.info("[mimosa] fetching product listing...")
+    # listing and category pages are fetched together; only the listing is required
+    html, *cat_pages = await asyncio.gather(
+        _afetch(session, start),
+        *[_afetch_safe(session, base + '/products/' + cat, timeout=15) for cat in categories]
+    )
+    s = parse_html(html)
     # Mimosa site often lists product links under /products/<slug>
-    for a in s.select('a[href]'):
-        href = a['href']
-        if href.startswith('/products/') and href.count('/')>=2:
-            full = requests.compat.urljoin(base, href)
-            # get product name from link text
-            name = clean_text(a.get_text())
-            if name:
-                rows.append({'category':'ptp','brand':'Mimosa','model':name,'source_url':full})
+    for a in css(s, PRODUCT_LINKS):
+        # get product name from link text
+        name = clean_text(node_text(a))
+        if name:
+            added += emit({'category':'ptp','brand':'Mimosa','model':name,'source_url':base + node_href(a)})
 
     # also check product pages categories
     # fallback: parse product category pages like /products/accessories, /products/antennas
-    for cat in ['accessories','antennas','backhaul','access-points','clients']:
+    for _, page in cat_pages:
         try:
-            page = requests.get(base + '/products/' + cat, headers=REQUEST_HEADERS, timeout=15)
-            page.raise_for_status()
-            ss = BeautifulSoup(page.text, "lxml")
-            for a in ss.select('a[href]'):
-                href = a['href']
-                if href.startswith('/products/') and href.count('/')>=2:
-                    n = clean_text(a.get_text())
-                    if n:
-                        rows.append({'category':'ptp','brand':'Mimosa','model':n,'source_url':requests.compat.urljoin(base,href)})
+            if isinstance(page, Exception):
+                continue
+            ss = parse_html(page)
+            for a in css(ss, PRODUCT_LINKS):
+                n = clean_text(node_text(a))
+                if n:
+                    added += emit({'category':'ptp','brand':'Mimosa','model':n,'source_url':base + node_href(a)})
         except Exception:
             pass
 
-    # dedupe
-    seen = set()
-    unique = []
-    for r in rows:
-        key = (r['brand'].lower(), r['model'].lower())
-        if key in seen: continue
-        seen.add(key)
-        unique.append(r)
-    print(f"[mimosa] Collected {len(unique)} unique models.")
-    return unique
+    log.info("[mimosa] Collected %d unique models.", added)
+    return added
 
 # ---------- Cambium scraper ----------
-def fetch_cambium():
-    rows = []
+async def fetch_cambium(session, emit):
+    added = 0
     base = "https://www.cambiumnetworks.com"
     start = base + "/products/"
-    print("[cambium] fetching product pages (product-finder fallback)...")
-    r = requests.get(start, headers=REQUEST_HEADERS, timeout=20)
-    r.raise_for_status()
-    s = BeautifulSoup(r.text, "lxml")
+    pf = base + "/product-finder/"
+    log.info("[cambium] fetching product pages (product-finder fallback)...")
+    html, (_, pf_html) = await asyncio.gather(_afetch(session, start), _afetch_safe(session, pf))
+    s = parse_html(html)
 
     # Cambium site has product finder and category pages. We'll try product finder which may use JS.
     # Try to find product links in page
-    for a in s.select('a[href]'):
-        href = a['href']
-        if href.startswith('/products/') and href.count('/')>=2:
-            full = requests.compat.urljoin(base, href)
-            name = clean_text(a.get_text())
-            if name:
-                rows.append({'category':'ptp','brand':'Cambium','model':name,'source_url':full})
+    for a in css(s, PRODUCT_LINKS):
+        name = clean_text(node_text(a))
+        if name:
+            added += emit({'category':'ptp','brand':'Cambium','model':name,'source_url':base + node_href(a)})
 
     # Try product finder page scraping
     try:
-        pf = base + "/product-finder/"
-        r2 = requests.get(pf, headers=REQUEST_HEADERS, timeout=20)
-        r2.raise_for_status()
-        s2 = BeautifulSoup(r2.text, "lxml")
+        if isinstance(pf_html, Exception):
+            raise pf_html
+        s2 = parse_html(pf_html)
         # find product names listed
-        for el in s2.select('.product-listing, .pf-result, .product-card, .product'):
-            txt = clean_text(el.get_text())
+        for el in css(s2, '.product-listing, .pf-result, .product-card, .product'):
+            txt = clean_text(node_text(el))
             if txt:
                 name = txt.splitlines()[0]
-                rows.append({'category':'ptp','brand':'Cambium','model':name,'source_url':pf})
+                added += emit({'category':'ptp','brand':'Cambium','model':name,'source_url':pf})
     except Exception:
         pass
 
-    # dedupe
-    seen = set()
-    unique = []
-    for r in rows:
-        key = (r['brand'].lower(), r['model'].lower())
-        if key in seen: continue
-        seen.add(key)
-        unique.append(r)
-    print(f"[cambium] Collected {len(unique)} unique models.")
-    return unique
+    log.info("[cambium] Collected %d unique models.", added)
+    return added
 
 # ---------- Ubiquiti scraper ----------
-def fetch_ubiquiti(use_selenium=False, driver=None):
+async def fetch_ubiquiti(session, emit, use_selenium=False, driver=None):
     """
     Ubiquiti product lists are spread across multiple domains (ui.com, store.ui.com, help.ui.com).
     Best try: crawl store.ui.com collections & ubiquiti.com product pages.
 
     If JS renders lists, consider enabling selenium and passing a driver.
     """
-    rows = []
+    added = 0
+    skipped = 0
     base_candidates = [
         "https://store.ui.com/collections/ubiquiti",  # store variants
         "https://www.ui.com/collections/unifi"  # sometimes used
@@ -270,123 +562,134 @@ def fetch_ubiquiti(use_selenium=False, driver=None):
         "https://store.ui.com/collections/all",
         "https://store.ui.com/collections/unifi"
     ]
-    tried = set()
-    for url in candidates + base_candidates:
-        if url in tried: continue
-        tried.add(url)
+    urls = list(dict.fromkeys(candidates + base_candidates))
+    if use_selenium and driver:
+        # a single browser can only render one page at a time
+        pages = []
+        for url in urls:
+            try:
+                html = await maybe_selenium_get(session, url, driver, wait_s=2.0, ready_css=UBIQUITI_PRODUCT_TITLES)
+                pages.append((url, html))
+            except Exception as e:
+                pages.append((url, e))
+    else:
+        pages = await asyncio.gather(*[_afetch_safe(session, u) for u in urls])
+    for url, html in pages:
         try:
-            if use_selenium and driver:
-                html = maybe_selenium_get(url, driver, wait_s=2.0)
-            else:
-                r = requests.get(url, headers=REQUEST_HEADERS, timeout=20)
-                r.raise_for_status()
-                html = r.text
-            s = BeautifulSoup(html, "lxml")
+            if isinstance(html, Exception):
+                raise html
+            s = parse_html(html)
+            origin = url[:url.find('/', len('https://'))]
             # look for product name markers
-            for sel in ['.product-card__title','.product-title','h2','h3', '.product-title a', '.card-title']:
-                for el in s.select(sel):
-                    name = clean_text(el.get_text())
-                    if name and len(name) < 200:
-                        rows.append({'category':'ap','brand':'Ubiquiti','model':name,'source_url':url})
+            for el in css(s, UBIQUITI_TITLES):
+                name = clean_text(node_text(el))
+                if name and len(name) < 200:
+                    added += emit({'category':'ap','brand':'Ubiquiti','model':name,'source_url':url})
             # also anchors to /products/ or /collections/
-            for a in s.select('a[href]'):
-                href = a['href']
-                if 'unifi' in href.lower() or 'airmax' in href.lower() or 'edge' in href.lower() or '/product' in href:
-                    name = clean_text(a.get_text())
+            for a in css(s, 'a[href]'):
+                href = node_href(a)
+                h = href.lower()
+                if 'unifi' in h or 'airmax' in h or 'edge' in h or '/product' in href:
+                    name = clean_text(node_text(a))
                     if name:
-                        rows.append({'category':'ap','brand':'Ubiquiti','model':name,'source_url':requests.compat.urljoin(url, href)})
+                        if href.startswith('http'):
+                            full = href
+                        elif href.startswith('/') and not href.startswith('//'):
+                            full = origin + href
+                        else:
+                            full = urljoin(url, href)
+                        added += emit({'category':'ap','brand':'Ubiquiti','model':name,'source_url':full})
         except Exception as e:
-            print("[ubiquiti] skip", url, "err:", e)
+            skipped += 1
+            log.debug("[ubiquiti] skip %s err: %s", url, e)
             continue
 
-    # dedupe
-    seen = set()
-    unique = []
-    for r in rows:
-        key = (r['brand'].lower(), r['model'].lower())
-        if key in seen: continue
-        seen.add(key)
-        unique.append(r)
-    print(f"[ubiquiti] Collected {len(unique)} unique models (best effort).")
-    return unique
+    if skipped:
+        log.info("[ubiquiti] Skipped %d pages that failed (--verbose for details).", skipped)
+    log.info("[ubiquiti] Collected %d unique models (best effort).", added)
+    return added
 
 # ---------- Main runner ----------
-def run_all(use_selenium=False):
-    rows_all = []
-
-    # MikroTik
-    try:
-        mk = fetch_mikrotik()
-        rows_all.extend(mk)
-    except Exception as e:
-        print("MikroTik failed:", e)
-
+def _start_chrome():
+    # setup headless chrome
+    chrome_opts = Options()
+    chrome_opts.add_argument("--headless=new")
+    chrome_opts.add_argument("--no-sandbox")
+    chrome_opts.add_argument("--disable-dev-shm-usage")
+    driver = webdriver.Chrome(options=chrome_opts)
+    # keep the browser's HTTP cache on so shared assets load once across pages
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+    return driver
+
+async def _fetch_ubiquiti_any(session, emit, use_selenium):
     # Ubiquiti (may need selenium)
+    if not (use_selenium and SELENIUM_OK):
+        return await fetch_ubiquiti(session, emit, use_selenium=False, driver=None)
+    driver = await asyncio.to_thread(_start_chrome)
     try:
-        if use_selenium and SELENIUM_OK:
-            # setup headless chrome
-            chrome_opts = Options()
-            chrome_opts.add_argument("--headless=new")
-            chrome_opts.add_argument("--no-sandbox")
-            chrome_opts.add_argument("--disable-dev-shm-usage")
-            driver = webdriver.Chrome(options=chrome_opts)
-            ub = fetch_ubiquiti(use_selenium=True, driver=driver)
-            driver.quit()
-        else:
-            ub = fetch_ubiquiti(use_selenium=False, driver=None)
-        rows_all.extend(ub)
-    except Exception as e:
-        print("Ubiquiti failed:", e)
+        return await fetch_ubiquiti(session, emit, use_selenium=True, driver=driver)
+    finally:
+        driver.quit()
 
-    # Cambium
-    try:
-        cb = fetch_cambium()
-        rows_all.extend(cb)
-    except Exception as e:
-        print("Cambium failed:", e)
+# Each brand crawls in its own process (own event loop, own GIL), so parsing on
+# one site doesn't hold up the others.
+BRANDS = ['MikroTik', 'Ubiquiti', 'Cambium', 'Mimosa']
 
-    # Mimosa
+async def _crawl_brand(name, emit, use_selenium=False):
     try:
-        mm = fetch_mimosa()
-        rows_all.extend(mm)
-    except Exception as e:
-        print("Mimosa failed:", e)
-
-    # Normalize and dedupe across brands
-    seen = set()
-    unique = []
-    for r in rows_all:
-        key = (r['brand'].strip().lower(), re.sub(r'[^a-z0-9\(\)\- ]','', r['model'].strip().lower()))
-        if key in seen:
-            continue
-        seen.add(key)
-        # ensure fields
-        r['category'] = r.get('category','')
-        r['brand'] = r.get('brand','')
-        r['model'] = r.get('model','')
-        r['source_url'] = r.get('source_url','')
-        unique.append(r)
+        async with make_session() as session:
+            if name == 'MikroTik':
+                await fetch_mikrotik(session, emit)
+            elif name == 'Ubiquiti':
+                await _fetch_ubiquiti_any(session, emit, use_selenium)
+            elif name == 'Cambium':
+                await fetch_cambium(session, emit)
+            elif name == 'Mimosa':
+                await fetch_mimosa(session, emit)
+    finally:
+        HTTP_CACHE.close()
+
+def crawl_brand(name, ts, use_selenium=False, log_level=logging.INFO):
+    """Worker entry point: crawl one brand, streaming its unique rows to <brand>_<ts>.csv.
+    Returns (path, row count)."""
+    setup_logging(log_level)
+    with CsvSink(name, ts) as sink:
+        asyncio.run(_crawl_brand(name, make_emit(sink.write), use_selenium))
+    return sink.path, sink.count
 
+def run_all(use_selenium=False):
     ts = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-    filename = f"all_products_{ts}.csv"
-    path = save_to_csv(unique, filename)
-
-    # Also save brand-separated CSVs
-    df = pd.DataFrame(unique)
-    for brand, g in df.groupby('brand'):
-        bn = re.sub(r'[^A-Za-z0-9]+','_', brand).strip('_').lower()
-        subpath = os.path.join(OUTPUT_DIR, f"{bn}_{ts}.csv")
-        g.to_csv(subpath, columns=['category','brand','model','source_url'], index=False)
-        print(f"[+] Saved brand CSV: {subpath}")
-
-    print("[*] Done. total unique models:", len(unique))
+    path = os.path.join(OUTPUT_DIR, f"all_products_{ts}.csv")
+    log_level = log.getEffectiveLevel()
+    total = 0
+    with open(path, 'w', newline='', encoding='utf-8') as out, ProcessPoolExecutor(max_workers=len(BRANDS)) as ex:
+        futures = {name: ex.submit(crawl_brand, name, ts, use_selenium, log_level) for name in BRANDS}
+        csv.writer(out).writerow(CsvSink.keys)
+        # Each worker streams its brand's rows to its own file, already deduped
+        # (the key includes the brand), so the combined file is just those files
+        # appended in BRANDS order, not completion order, so re-runs can be diffed.
+        for name in BRANDS:
+            try:
+                brand_path, count = futures[name].result()
+            except Exception as e:
+                log.error("%s failed: %s", name, e)
+                continue
+            if count:
+                append_csv(out, brand_path)
+                total += count
+                log.info("[+] Saved brand CSV: %s", brand_path)
+
+    log.info("[+] Saved %d rows to %s", total, path)
+    log.info("[*] Done. total unique models: %d", total)
     return path
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument('--use-selenium', action='store_true', help='Use Selenium (ChromeDriver) for JS-heavy sites')
+    ap.add_argument('--verbose', action='store_true', help='Log every skipped page')
     args = ap.parse_args()
+    setup_logging(logging.DEBUG if args.verbose else logging.INFO)
     if args.use_selenium and not SELENIUM_OK:
-        print("Selenium not available. Install selenium and chromedriver to use this mode.")
+        log.error("Selenium not available. Install selenium and chromedriver to use this mode.")
         sys.exit(1)
     run_all(use_selenium=args.use_selenium)